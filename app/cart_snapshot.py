@@ -0,0 +1,41 @@
+import struct
+
+# magic, format version, kind, cart version, base cart version, line count
+SNAPSHOT_HEADER = struct.Struct("<2sBBQQI")
+SNAPSHOT_MAGIC = b"SC"
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_FULL = 0
+SNAPSHOT_DELTA = 1
+COUNT_SIZE = struct.calcsize("<I")
+MAX_COUNT = 2 ** (8 * COUNT_SIZE) - 1
+
+
+def encode_snapshot(kind, version, base_version, lines):
+    # Counts go into fixed-width little-endian uint32 values, keys into one NUL separated blob
+    if any("\x00" in name for name in lines):
+        raise ValueError("Product name must not contain NUL characters")
+    if any(count > MAX_COUNT for count in lines.values()):
+        raise ValueError(f"Product amount must not exceed {MAX_COUNT} in a cart snapshot")
+    size = len(lines)
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, kind, version, base_version, size)
+    counts = struct.pack(f"<{size}I", *lines.values())
+    return header + counts + "\x00".join(lines).encode("utf-8")
+
+
+def decode_snapshot(data):
+    if len(data) < SNAPSHOT_HEADER.size:
+        raise ValueError("Cart snapshot is truncated")
+    magic, format_version, kind, version, base_version, size = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or format_version != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError("Unsupported cart snapshot format")
+    if kind not in (SNAPSHOT_FULL, SNAPSHOT_DELTA):
+        raise ValueError("Unknown cart snapshot kind")
+
+    counts_end = SNAPSHOT_HEADER.size + COUNT_SIZE * size
+    if len(data) < counts_end:
+        raise ValueError("Cart snapshot is truncated")
+    counts = struct.unpack_from(f"<{size}I", data, SNAPSHOT_HEADER.size)
+    keys = bytes(data[counts_end:]).decode("utf-8").split("\x00") if size else []
+    if len(keys) != size:
+        raise ValueError("Cart snapshot is corrupted")
+    return kind, version, base_version, dict(zip(keys, counts))
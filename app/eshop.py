@@ -3,16 +3,19 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from services import ShippingService
+from app.cart_snapshot import SNAPSHOT_DELTA, SNAPSHOT_FULL, decode_snapshot, encode_snapshot
 
 class Product:
     available_amount: int
     name: str
     price: float
+    category: str
 
-    def __init__(self, name, price, available_amount):
+    def __init__(self, name, price, available_amount, category=None):
         self.name = name
         self.price = price
         self.available_amount = available_amount
+        self.category = category
         if price < 0 or available_amount < 0:
             raise ValueError("Price and availability must be non-negative")
 
@@ -36,14 +39,18 @@ class Product:
 
 class ShoppingCart:
     products: Dict[Product, int]
+    version: int
 
     def __init__(self):
         self.products = dict()
+        self.version = 0
 
     def contains_product(self, product):
         return product in self.products
 
-    def calculate_total(self):
+    def calculate_total(self, pricing_engine=None):
+        if pricing_engine is not None:
+            return pricing_engine.price_cart(self).total
         return sum([p.price * count for p, count in self.products.items()])
 
     def add_product(self, product: Product, amount: int):
@@ -52,10 +59,12 @@ class ShoppingCart:
         if not product.is_available(amount):
             raise ValueError(f"Product {product} has only {product.available_amount} items")
         self.products[product] = amount
+        self.version += 1
 
     def remove_product(self, product):
         if product in self.products:
             del self.products[product]
+            self.version += 1
 
     def submit_cart_order(self):
         product_ids = []
@@ -63,8 +72,64 @@ class ShoppingCart:
             product.buy(count)
             product_ids.append(str(product))
         self.products.clear()
+        self.version += 1
         return product_ids
 
+    def _snapshot_lines(self):
+        return {str(product): count for product, count in self.products.items()}
+
+    def to_bytes(self):
+        return encode_snapshot(SNAPSHOT_FULL, self.version, 0, self._snapshot_lines())
+
+    def to_delta_bytes(self, base_snapshot: bytes):
+        _, base_version, _, base_lines = decode_snapshot(base_snapshot)
+        if self.version <= base_version:
+            raise ValueError(f"Cart version {self.version} must be newer than base version {base_version}")
+        lines = self._snapshot_lines()
+        changes = {name: count for name, count in lines.items() if base_lines.get(name) != count}
+        # Zero count marks a removed product
+        changes.update((name, 0) for name in base_lines if name not in lines)
+        return encode_snapshot(SNAPSHOT_DELTA, self.version, base_version, changes)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, product_lookup):
+        kind, version, _, lines = decode_snapshot(data)
+        if kind != SNAPSHOT_FULL:
+            raise ValueError("Cart snapshot is a delta, full snapshot expected")
+        if not all(lines.values()):
+            raise ValueError("Full cart snapshot must not contain zero counts")
+        cart = cls()
+        cart.products = cls._resolve_lines(lines, product_lookup)
+        cart.version = version
+        return cart
+
+    def apply_delta(self, data: bytes, product_lookup):
+        kind, version, base_version, changes = decode_snapshot(data)
+        if kind != SNAPSHOT_DELTA:
+            raise ValueError("Cart snapshot is not a delta")
+        if base_version != self.version:
+            raise ValueError(f"Delta is based on cart version {base_version}, cart is at {self.version}")
+        # The pricing cache is keyed on version, so it must never move backwards
+        if version <= base_version:
+            raise ValueError(f"Delta version {version} must be newer than base version {base_version}")
+
+        # Every product is resolved before the cart changes, so a failed lookup leaves it untouched
+        updated = self._resolve_lines({name: count for name, count in changes.items() if count}, product_lookup)
+        products = {p: count for p, count in self.products.items() if str(p) not in changes}
+        products.update(updated)
+        self.products = products
+        self.version = version
+
+    @staticmethod
+    def _resolve_lines(lines, product_lookup):
+        products = {}
+        for name, count in lines.items():
+            product = product_lookup(name)
+            if product is None:
+                raise ValueError(f"Product {name} is not found")
+            products[product] = count
+        return products
+
 @dataclass
 class Order:
     cart: ShoppingCart
@@ -75,7 +140,6 @@ class Order:
         if not due_date:
             due_date = datetime.now(timezone.utc) + timedelta(seconds=3)
         product_ids = self.cart.submit_cart_order()
-        print(due_date)
         return self.shipping_service.create_shipping(shipping_type, product_ids, self.order_id, due_date)
 
 @dataclass()
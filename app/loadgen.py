@@ -0,0 +1,380 @@
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from app.eshop import Product, ShoppingCart, Order
+from services import ShippingService
+
+
+def percentiles(samples):
+    if not samples:
+        return {"count": 0}
+    samples = sorted(samples)
+
+    def pick(q):
+        return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 3)
+
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+class LoadStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.shipping_ids = []
+        self.processed_ids = set()
+        self.errored_ids = set()
+
+    def record(self, stage, seconds):
+        with self.lock:
+            self.latencies.setdefault(stage, []).append(seconds)
+
+    def error(self, stage):
+        with self.lock:
+            self.errors[stage] = self.errors.get(stage, 0) + 1
+
+    def shipping_placed(self, shipping_id):
+        with self.lock:
+            self.shipping_ids.append(shipping_id)
+
+    def shipping_processed(self, shipping_id):
+        with self.lock:
+            self.processed_ids.add(shipping_id)
+
+    def shipping_errored(self, shipping_id):
+        with self.lock:
+            self.errored_ids.add(shipping_id)
+            self.errors["process_shipping"] = self.errors.get("process_shipping", 0) + 1
+
+    def snapshot(self):
+        with self.lock:
+            latencies = {stage: list(samples) for stage, samples in self.latencies.items()}
+            return (latencies, dict(self.errors), list(self.shipping_ids),
+                    set(self.processed_ids), set(self.errored_ids))
+
+
+class LagTrackingPublisher:
+    # Wraps a publisher to measure how long each shipping waits in the queue
+    def __init__(self, publisher, stats: LoadStats):
+        self.publisher = publisher
+        self.stats = stats
+        self.sent_at = {}
+        self.polled = set()
+        self.lock = threading.Lock()
+
+    def send_new_shipping(self, shipping_id: str):
+        with self.lock:
+            self.sent_at[shipping_id] = time.perf_counter()
+        return self.publisher.send_new_shipping(shipping_id)
+
+    def poll_shipping(self, batch_size: int = 10):
+        shipping = self.publisher.poll_shipping(batch_size)
+        now = time.perf_counter()
+        with self.lock:
+            sent = [self.sent_at.pop(shipping_id, None) for shipping_id in shipping]
+            self.polled.update(shipping)
+        for sent_at in sent:
+            if sent_at is not None:
+                self.stats.record("queue_lag", now - sent_at)
+        return shipping
+
+    def pending(self):
+        with self.lock:
+            return len(self.sent_at)
+
+    def was_polled(self, shipping_id):
+        with self.lock:
+            return shipping_id in self.polled
+
+
+class TrackingShippingService(ShippingService):
+    # Records which shipping process_shipping_batch actually finished, so dequeued
+    # shipping from an aborted batch is not mistaken for processed
+    def __init__(self, repository, publisher, stats: LoadStats):
+        super().__init__(repository, publisher)
+        self.stats = stats
+
+    def process_shipping(self, shipping_id):
+        try:
+            result = super().process_shipping(shipping_id)
+        except Exception:
+            self.stats.shipping_errored(shipping_id)
+            raise
+        self.stats.shipping_processed(shipping_id)
+        return result
+
+
+def build_backend(name):
+    if name == "memory":
+        from services.memory import InMemoryShippingRepository, InMemoryShippingPublisher
+        return InMemoryShippingRepository(), InMemoryShippingPublisher()
+
+    from services.repository import ShippingRepository
+    from services.publisher import ShippingPublisher
+    ensure_localstack_resources()
+    return ShippingRepository(), ShippingPublisher()
+
+
+def ensure_localstack_resources():
+    import boto3
+    from services.config import AWS_ENDPOINT_URL, AWS_REGION, SHIPPING_TABLE_NAME
+    from services.db import enable_time_to_live
+
+    dynamo_client = boto3.client(
+        "dynamodb",
+        endpoint_url=AWS_ENDPOINT_URL,
+        region_name=AWS_REGION,
+        aws_access_key_id="test",
+        aws_secret_access_key="test"
+    )
+    if SHIPPING_TABLE_NAME not in dynamo_client.list_tables()["TableNames"]:
+        dynamo_client.create_table(
+            TableName=SHIPPING_TABLE_NAME,
+            KeySchema=[{"AttributeName": "shipping_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "shipping_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        dynamo_client.get_waiter("table_exists").wait(TableName=SHIPPING_TABLE_NAME)
+        enable_time_to_live(SHIPPING_TABLE_NAME)
+
+
+class Customer:
+    def __init__(self, service: ShippingService, stats: LoadStats, products_per_cart: int, due_seconds: float):
+        self.service = service
+        self.stats = stats
+        self.due_seconds = due_seconds
+        # Own catalog per customer and at most one order in flight, Product.buy is not thread-safe
+        self.lock = threading.Lock()
+        self.catalog = [
+            Product(name=f"product_{i}", price=10.0 + i, available_amount=10 ** 9)
+            for i in range(products_per_cart)
+        ]
+        self.shipping_type = ShippingService.list_available_shipping_type()[0]
+
+    def place_order(self, started_at=None):
+        started_at = started_at if started_at is not None else time.perf_counter()
+        # A fixed-rate arrival for a busy customer waits here, which shows up as queueing delay
+        with self.lock:
+            self._place_order(started_at)
+
+    def _place_order(self, started_at):
+        try:
+            cart = ShoppingCart()
+            for product in self.catalog:
+                cart.add_product(product, 1)
+            cart.calculate_total()
+        except Exception:  # pylint: disable=broad-except
+            self.stats.error("cart")
+            return
+        cart_done = time.perf_counter()
+        self.stats.record("cart", cart_done - started_at)
+
+        try:
+            order = Order(cart, self.service, str(uuid.uuid4()))
+            shipping_id = order.place_order(self.shipping_type, datetime.now(timezone.utc) + timedelta(seconds=self.due_seconds))
+        except Exception:  # pylint: disable=broad-except
+            self.stats.error("place_order")
+            return
+        finished = time.perf_counter()
+        self.stats.shipping_placed(shipping_id)
+        self.stats.record("place_order", finished - cart_done)
+        self.stats.record("end_to_end_order", finished - started_at)
+
+
+def run_consumer(service: ShippingService, stats: LoadStats, stop: threading.Event, abort: threading.Event,
+                 publisher: LagTrackingPublisher):
+    backoff = 0.0
+    while not abort.is_set() and (not stop.is_set() or publisher.pending()):
+        started = time.perf_counter()
+        try:
+            processed = service.process_shipping_batch()
+        except Exception:  # pylint: disable=broad-except
+            stats.error("process_shipping_batch")
+            # Back off so an unreachable backend does not spin the consumer
+            backoff = min(max(backoff * 2, 0.05), 1.0)
+            abort.wait(backoff)
+            continue
+        backoff = 0.0
+        if processed:
+            stats.record("process_shipping_batch", time.perf_counter() - started)
+
+
+def shipping_outcomes(repository, shipping_ids, publisher: LagTrackingPublisher, processed_ids, errored_ids):
+    final_status = {}
+    processed = 0
+    lost_update = 0
+    errored = 0
+    dropped = 0
+    unprocessed = 0
+    for shipping_id in shipping_ids:
+        shipping = repository.get_shipping(shipping_id)
+        status = shipping["shipping_status"] if shipping else "missing"
+        final_status[status] = final_status.get(status, 0) + 1
+        if shipping_id in processed_ids:
+            processed += 1
+            if status not in (ShippingService.SHIPPING_COMPLETED, ShippingService.SHIPPING_FAILED):
+                # process_shipping finished, yet a concurrent write replaced the final status
+                lost_update += 1
+        elif shipping_id in errored_ids:
+            errored += 1
+        elif publisher.was_polled(shipping_id):
+            # Dequeued in a batch that raised on another message before reaching this one
+            dropped += 1
+        else:
+            unprocessed += 1
+    return {
+        "final_status": final_status,
+        "processed": processed,
+        "failed": final_status.get(ShippingService.SHIPPING_FAILED, 0),
+        "lost_update": lost_update,
+        "errored": errored,
+        "dropped": dropped,
+        "unprocessed": unprocessed,
+    }
+
+
+def run_closed_loop(customers, deadline):
+    def loop(customer):
+        while time.perf_counter() < deadline:
+            customer.place_order()
+
+    threads = [threading.Thread(target=loop, args=(customer,)) for customer in customers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_fixed_rate(customers, deadline, rate):
+    # Latency counts from the scheduled arrival, so a saturated system shows up as queueing delay
+    interval = 1.0 / rate
+    next_arrival = time.perf_counter()
+    arrivals = 0
+    with ThreadPoolExecutor(max_workers=len(customers)) as executor:
+        while next_arrival < deadline:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            customer = customers[arrivals % len(customers)]
+            executor.submit(customer.place_order, next_arrival)
+            arrivals += 1
+            next_arrival += interval
+
+
+def run_load(backend="memory", customers=10, consumers=2, duration=10.0, rate=None,
+             products_per_cart=3, due_seconds=60.0, drain_timeout=30.0):
+    if customers <= 0 or consumers <= 0:
+        raise ValueError("Customers and consumers must be positive")
+    if rate is not None and rate <= 0:
+        raise ValueError("Arrival rate must be positive")
+
+    stats = LoadStats()
+    repository, publisher = build_backend(backend)
+    tracking_publisher = LagTrackingPublisher(publisher, stats)
+    service = TrackingShippingService(repository, tracking_publisher, stats)
+
+    stop = threading.Event()
+    abort = threading.Event()
+    consumer_threads = [
+        threading.Thread(target=run_consumer, args=(service, stats, stop, abort, tracking_publisher), daemon=True)
+        for _ in range(consumers)
+    ]
+    for thread in consumer_threads:
+        thread.start()
+
+    simulated = [Customer(service, stats, products_per_cart, due_seconds) for _ in range(customers)]
+    started = time.perf_counter()
+    deadline = started + duration
+    if rate is None:
+        run_closed_loop(simulated, deadline)
+    else:
+        run_fixed_rate(simulated, deadline, rate)
+    load_finished = time.perf_counter()
+
+    stop.set()
+    for thread in consumer_threads:
+        thread.join(max(0.0, drain_timeout - (time.perf_counter() - load_finished)))
+    # Consumers still draining after the timeout are told to quit and joined, so no one writes stats below
+    abort.set()
+    for thread in consumer_threads:
+        thread.join()
+    drained = time.perf_counter()
+
+    latencies, errors, shipping_ids, processed_ids, errored_ids = stats.snapshot()
+    placed = len(latencies.get("place_order", []))
+    attempted = placed + errors.get("cart", 0) + errors.get("place_order", 0)
+    outcomes = shipping_outcomes(repository, shipping_ids, tracking_publisher, processed_ids, errored_ids)
+    shipping_errors = sum(
+        outcomes[key] for key in ("failed", "lost_update", "errored", "dropped", "unprocessed")
+    )
+    return {
+        "config": {
+            "backend": backend,
+            "mode": "closed" if rate is None else "fixed_rate",
+            "customers": customers,
+            "consumers": consumers,
+            "duration_s": duration,
+            "rate_per_s": rate,
+            "products_per_cart": products_per_cart,
+        },
+        "orders": {
+            "attempted": attempted,
+            "placed": placed,
+            "orders_per_s": round(placed / (load_finished - started), 3),
+            "error_rate": round((attempted - placed) / attempted, 6) if attempted else 0.0,
+        },
+        "shipping": {
+            **outcomes,
+            "processed_per_s": round(outcomes["processed"] / (drained - started), 3),
+            "error_rate": round(shipping_errors / placed, 6) if placed else 0.0,
+        },
+        "stages": {stage: percentiles(samples) for stage, samples in sorted(latencies.items())},
+        "errors": errors,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulated customer load through cart, order and shipping")
+    parser.add_argument("--backend", choices=["memory", "localstack"], default="memory")
+    parser.add_argument("--customers", type=int, default=10)
+    parser.add_argument("--consumers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--rate", type=float, default=None, help="orders/s; closed loop when omitted")
+    parser.add_argument("--products-per-cart", type=int, default=3)
+    parser.add_argument("--due-seconds", type=float, default=60.0)
+    parser.add_argument("--output", default=None, help="summary file, stdout when omitted")
+    args = parser.parse_args(argv)
+
+    summary = run_load(
+        backend=args.backend,
+        customers=args.customers,
+        consumers=args.consumers,
+        duration=args.duration,
+        rate=args.rate,
+        products_per_cart=args.products_per_cart,
+        due_seconds=args.due_seconds,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(summary, output, indent=2)
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
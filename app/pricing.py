@@ -0,0 +1,150 @@
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class PercentageDiscount:
+    percent: float
+    product_names: Tuple[str, ...] = ()
+    category: Optional[str] = None
+
+    def __post_init__(self):
+        if not 0 < self.percent <= 100:
+            raise ValueError("Discount percent must be in (0, 100]")
+        if isinstance(self.product_names, str):
+            raise ValueError("Product names must be a tuple of names, not a single string")
+        if not self.product_names and self.category is None:
+            raise ValueError("Discount must target products or a category")
+
+
+@dataclass(frozen=True)
+class BuyNGetM:
+    product_name: str
+    buy: int
+    get: int
+
+    def __post_init__(self):
+        if self.buy <= 0 or self.get <= 0:
+            raise ValueError("Buy and get amounts must be positive")
+
+
+@dataclass(frozen=True)
+class TieredPricing:
+    product_name: str
+    # (minimal amount, unit price) pairs
+    tiers: Tuple[Tuple[int, float], ...]
+
+    def __post_init__(self):
+        if not self.tiers:
+            raise ValueError("Tiered pricing must have at least one tier")
+        if any(amount <= 0 or price < 0 for amount, price in self.tiers):
+            raise ValueError("Tier amount must be positive and price non-negative")
+
+
+@dataclass(frozen=True)
+class PricedLine:
+    product_name: str
+    count: int
+    unit_price: float
+    subtotal: float
+    discount: float
+
+    @property
+    def total(self):
+        return self.subtotal - self.discount
+
+
+@dataclass(frozen=True)
+class PricedCart:
+    lines: Tuple[PricedLine, ...] = ()
+    subtotal: float = 0.0
+    discount: float = 0.0
+
+    @property
+    def total(self):
+        return self.subtotal - self.discount
+
+
+@dataclass
+class _ProductRules:
+    tiers: Tuple[Tuple[int, float], ...] = ()
+    free_items: Optional[Tuple[int, int]] = None
+    percent: float = 0.0
+
+
+class PricingEngine:
+    # Overlapping percentage discounts keep the best percent, a second buy-N-get-M or
+    # tiered rule for the same product is rejected. Results are cached per cart version,
+    # which does not track Product.price, so price changes require a new engine.
+    def __init__(self, rules):
+        self.product_rules: Dict[str, _ProductRules] = {}
+        self.category_percent: Dict[str, float] = {}
+        self._cache = weakref.WeakKeyDictionary()
+        self._compile(rules)
+
+    def _compile(self, rules):
+        for rule in rules:
+            if isinstance(rule, PercentageDiscount):
+                for name in rule.product_names:
+                    product_rules = self.product_rules.setdefault(name, _ProductRules())
+                    product_rules.percent = max(product_rules.percent, rule.percent)
+                if rule.category is not None:
+                    self.category_percent[rule.category] = max(
+                        self.category_percent.get(rule.category, 0.0), rule.percent
+                    )
+            elif isinstance(rule, BuyNGetM):
+                product_rules = self.product_rules.setdefault(rule.product_name, _ProductRules())
+                if product_rules.free_items is not None:
+                    raise ValueError(f"Product {rule.product_name} already has a buy-N-get-M rule")
+                product_rules.free_items = (rule.buy, rule.get)
+            elif isinstance(rule, TieredPricing):
+                product_rules = self.product_rules.setdefault(rule.product_name, _ProductRules())
+                if product_rules.tiers:
+                    raise ValueError(f"Product {rule.product_name} already has a tiered pricing rule")
+                # Highest threshold first so the first match is the best tier
+                product_rules.tiers = tuple(sorted(rule.tiers, reverse=True))
+            else:
+                raise ValueError(f"Unknown pricing rule {rule!r}")
+
+    def _price_line(self, product, count):
+        unit_price = product.price
+        discount = 0.0
+        product_rules = self.product_rules.get(product.name)
+        percent = self.category_percent.get(product.category, 0.0)
+
+        if product_rules is not None:
+            for min_amount, tier_price in product_rules.tiers:
+                if count >= min_amount:
+                    unit_price = tier_price
+                    break
+            percent = max(percent, product_rules.percent)
+
+        subtotal = unit_price * count
+        paid_count = count
+        if product_rules is not None and product_rules.free_items is not None:
+            buy, get = product_rules.free_items
+            paid_count -= (count // (buy + get)) * get
+            discount += unit_price * (count - paid_count)
+        if percent:
+            discount += unit_price * paid_count * percent / 100
+
+        return PricedLine(product.name, count, unit_price, subtotal, discount)
+
+    def price_cart(self, cart):
+        cached = self._cache.get(cart)
+        if cached is not None and cached[0] == cart.version:
+            return cached[1]
+
+        lines = tuple(self._price_line(product, count) for product, count in cart.products.items())
+        priced = PricedCart(
+            lines,
+            sum(line.subtotal for line in lines),
+            sum(line.discount for line in lines)
+        )
+
+        self._cache[cart] = (cart.version, priced)
+        return priced
+
+    def price_carts(self, carts):
+        return [self.price_cart(cart) for cart in carts]
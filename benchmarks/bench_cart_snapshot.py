@@ -0,0 +1,57 @@
+# Run from the repository root: python -m benchmarks.bench_cart_snapshot
+import argparse
+import json
+import pickle
+import timeit
+
+from app.eshop import Product, ShoppingCart
+
+
+def build_cart(lines):
+    catalog = {f"product_{i}": Product(name=f"product_{i}", price=i + 0.99, available_amount=10 ** 6) for i in range(lines)}
+    cart = ShoppingCart()
+    for i, product in enumerate(catalog.values()):
+        cart.add_product(product, i % 50 + 1)
+    return catalog, cart
+
+
+def to_json(cart):
+    return json.dumps({"version": cart.version, "lines": {str(p): count for p, count in cart.products.items()}}).encode("utf-8")
+
+
+def from_json(data, catalog):
+    payload = json.loads(data)
+    cart = ShoppingCart()
+    cart.products = {catalog[name]: count for name, count in payload["lines"].items()}
+    cart.version = payload["version"]
+    return cart
+
+
+def bench(name, encode, decode, lines, number):
+    data = encode()
+    encode_s = min(timeit.repeat(encode, number=number, repeat=3)) / number
+    decode_s = min(timeit.repeat(lambda: decode(data), number=number, repeat=3)) / number
+    print(f"{name:<8} {len(data):>10} B  encode {encode_s / lines * 1e6:8.3f} us/line"
+          f"  decode {decode_s / lines * 1e6:8.3f} us/line"
+          f"  round trip {(encode_s + decode_s) / lines * 1e6:8.3f} us/line")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cart snapshot formats, run as python -m benchmarks.bench_cart_snapshot")
+    parser.add_argument("--lines", type=int, default=10000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    catalog, cart = build_cart(args.lines)
+    bench("binary", cart.to_bytes, lambda data: ShoppingCart.from_bytes(data, catalog.get), args.lines, args.number)
+    bench("pickle", lambda: pickle.dumps(cart, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads, args.lines, args.number)
+    bench("json", lambda: to_json(cart), lambda data: from_json(data, catalog), args.lines, args.number)
+
+    base = cart.to_bytes()
+    cart.add_product(catalog["product_0"], 7)
+    delta = cart.to_delta_bytes(base)
+    print(f"delta    {len(delta):>10} B  for one edited line")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from .config import SHIPPING_ARCHIVE_DIR
+from .service import ShippingService
+
+ARCHIVE_PREFIX = "shipping-archive-"
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+
+def _json_default(value):
+    # boto3 returns DynamoDB numbers as Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ShippingArchiveExporter:
+    TERMINAL_STATUSES = (ShippingService.SHIPPING_COMPLETED, ShippingService.SHIPPING_FAILED)
+
+    def __init__(self, repository, archive_dir: str = SHIPPING_ARCHIVE_DIR, chunk_size: int = 10000):
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive")
+        self.repository = repository
+        self.archive_dir = archive_dir
+        self.chunk_size = chunk_size
+
+    def export_finished_shipping(self):
+        # Only not yet archived shipping is exported, so repeated runs append new chunks without copies
+        os.makedirs(self.archive_dir, exist_ok=True)
+        run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+        paths = []
+        chunk = []
+        for item in self.repository.scan_shipping_by_status(self.TERMINAL_STATUSES):
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                paths.append(self._write_chunk(run_id, len(paths), chunk))
+                chunk = []
+        if chunk:
+            paths.append(self._write_chunk(run_id, len(paths), chunk))
+
+        return paths
+
+    def _write_chunk(self, run_id, index, chunk):
+        path = os.path.join(self.archive_dir, f"{ARCHIVE_PREFIX}{run_id}-{index:05d}{ARCHIVE_SUFFIX}")
+        # Written under a temporary name so the reader never sees a partial chunk
+        tmp_path = path + ".tmp"
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as archive_file:
+                for item in chunk:
+                    archive_file.write(json.dumps(item, default=_json_default, ensure_ascii=False))
+                    archive_file.write("\n")
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # Marked only after the chunk is durable, a crash before this re-exports the chunk next run
+        self.repository.mark_shipping_archived([item["shipping_id"] for item in chunk])
+        return path
+
+
+class ShippingArchiveReader:
+    def __init__(self, archive_dir: str = SHIPPING_ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+
+    def list_archives(self):
+        if not os.path.isdir(self.archive_dir):
+            return []
+        return sorted(
+            os.path.join(self.archive_dir, name)
+            for name in os.listdir(self.archive_dir)
+            if name.startswith(ARCHIVE_PREFIX) and name.endswith(ARCHIVE_SUFFIX)
+        )
+
+    def iter_shipping(self, **filters):
+        # gzip decompresses in fixed-size blocks, so only one line is held in memory at a time
+        for path in self.list_archives():
+            with gzip.open(path, "rt", encoding="utf-8") as archive_file:
+                for line in archive_file:
+                    item = json.loads(line)
+                    if all(item.get(key) == value for key, value in filters.items()):
+                        yield item
+
+    def get_shipping(self, shipping_id):
+        return next(self.iter_shipping(shipping_id=shipping_id), None)
+
+    def count_by_status(self):
+        counts = {}
+        for item in self.iter_shipping():
+            status = item.get("shipping_status")
+            counts[status] = counts.get(status, 0) + 1
+        return counts
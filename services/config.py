@@ -4,3 +4,7 @@ AWS_ENDPOINT_URL = os.getenv("AWS_ENDPOINT_URL", "http://localhost:4566")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 SHIPPING_TABLE_NAME = os.getenv("SHIPPING_TABLE_NAME", "ShippingTable")
 SHIPPING_QUEUE = os.getenv("SHIPPING_QUEUE_NAME", "ShippingQueue")
+# Finished shipments expire SHIPPING_TTL_DAYS after their final status, so the
+# archive export must run more often than this window
+SHIPPING_TTL_DAYS = int(os.getenv("SHIPPING_TTL_DAYS", "30"))
+SHIPPING_ARCHIVE_DIR = os.getenv("SHIPPING_ARCHIVE_DIR", "archive")
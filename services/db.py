@@ -9,3 +9,11 @@ def get_dynamodb_resource():
         aws_access_key_id="test",
         aws_secret_access_key="test"
     )
+
+
+def enable_time_to_live(table_name, attribute_name="expires_at"):
+    client = get_dynamodb_resource().meta.client
+    return client.update_time_to_live(
+        TableName=table_name,
+        TimeToLiveSpecification={"Enabled": True, "AttributeName": attribute_name},
+    )
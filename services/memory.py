@@ -0,0 +1,63 @@
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from .repository import build_shipping_item, shipping_expires_at
+
+
+class InMemoryShippingRepository:
+    def __init__(self):
+        self.items = {}
+        self.lock = threading.Lock()
+
+    def get_shipping(self, shipping_id):
+        with self.lock:
+            item = self.items.get(shipping_id)
+            return dict(item) if item is not None else None
+
+    def create_shipping(self, shipping_type: str, product_ids: list, order_id: str, status: str, due_date: datetime):
+        item = build_shipping_item(shipping_type, product_ids, order_id, status, due_date)
+        with self.lock:
+            self.items[item["shipping_id"]] = item
+        return item["shipping_id"]
+
+    def update_shipping_status(self, shipping_id, status, finished: bool = False):
+        with self.lock:
+            self.items[shipping_id]["shipping_status"] = status
+            if finished:
+                self.items[shipping_id]["expires_at"] = shipping_expires_at()
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+    def mark_shipping_archived(self, shipping_ids):
+        archived_at = datetime.now(timezone.utc).isoformat()
+        with self.lock:
+            for shipping_id in shipping_ids:
+                self.items[shipping_id]["archived_at"] = archived_at
+
+    def scan_shipping_by_status(self, statuses, page_size: int = 100, include_archived: bool = False):
+        with self.lock:
+            items = [
+                dict(item) for item in self.items.values()
+                if item["shipping_status"] in statuses and (include_archived or "archived_at" not in item)
+            ]
+        yield from items
+
+
+class InMemoryShippingPublisher:
+    def __init__(self, wait_seconds: float = 0.1):
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.wait_seconds = wait_seconds
+
+    def send_new_shipping(self, shipping_id: str):
+        with self.condition:
+            self.queue.append(shipping_id)
+            self.condition.notify()
+        return str(uuid4())
+
+    def poll_shipping(self, batch_size: int = 10):
+        with self.condition:
+            if not self.queue:
+                self.condition.wait(self.wait_seconds)
+            return [self.queue.popleft() for _ in range(min(batch_size, len(self.queue)))]
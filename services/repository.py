@@ -1,8 +1,29 @@
-from .config import SHIPPING_TABLE_NAME
+from .config import SHIPPING_TABLE_NAME, SHIPPING_TTL_DAYS
 from .db import get_dynamodb_resource
 
+from boto3.dynamodb.conditions import Attr
 from uuid import uuid4
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+
+def shipping_expires_at(from_date: datetime = None):
+    # DynamoDB TTL expects epoch seconds as a Number attribute
+    from_date = from_date or datetime.now(timezone.utc)
+    return int((from_date + timedelta(days=SHIPPING_TTL_DAYS)).timestamp())
+
+
+def build_shipping_item(shipping_type: str, product_ids: list, order_id: str, status: str, due_date: datetime):
+    created_date = datetime.now(timezone.utc)
+    return {
+        "shipping_id": str(uuid4()),
+        "shipping_type": shipping_type,
+        "order_id": order_id,
+        "product_ids": ",".join(product_ids),
+        "shipping_status": status,
+        "created_date": created_date.isoformat(),
+        "due_date": due_date.replace(tzinfo=timezone.utc).isoformat(),
+        "expires_at": shipping_expires_at(created_date)
+    }
 
 
 class ShippingRepository:
@@ -18,28 +39,50 @@ class ShippingRepository:
         return response.get("Item")
 
     def create_shipping(self, shipping_type: str, product_ids: list, order_id: str, status: str, due_date: datetime):
-        shipping_id = str(uuid4())
-        item = {
-            "shipping_id": shipping_id,
-            "shipping_type": shipping_type,
-            "order_id": order_id,
-            "product_ids": ",".join(product_ids),
-            "shipping_status": status,
-            "created_date": datetime.now(timezone.utc).isoformat(),
-            "due_date": due_date.replace(tzinfo=timezone.utc).isoformat()
-        }
+        item = build_shipping_item(shipping_type, product_ids, order_id, status, due_date)
         self.table.put_item(Item=item)
-        return shipping_id
+        return item["shipping_id"]
+
+    def update_shipping_status(self, shipping_id, status, finished: bool = False):
+        update_expression = 'SET shipping_status = :sh_status'
+        values = {':sh_status': status}
+        if finished:
+            # Restart the TTL window so the exporter gets a full window to archive the result
+            update_expression += ', expires_at = :expires_at'
+            values[':expires_at'] = shipping_expires_at()
 
-    def update_shipping_status(self, shipping_id, status):
         response = self.table.update_item(
             Key={
                 'shipping_id': shipping_id,
             },
-            UpdateExpression='SET shipping_status = :sh_status',
-            ExpressionAttributeValues={
-                ':sh_status': status
-            }
+            UpdateExpression=update_expression,
+            ExpressionAttributeValues=values
         )
 
         return response
+
+    def mark_shipping_archived(self, shipping_ids):
+        archived_at = datetime.now(timezone.utc).isoformat()
+        for shipping_id in shipping_ids:
+            self.table.update_item(
+                Key={'shipping_id': shipping_id},
+                UpdateExpression='SET archived_at = :archived_at',
+                ExpressionAttributeValues={':archived_at': archived_at}
+            )
+
+    def scan_shipping_by_status(self, statuses, page_size: int = 100, include_archived: bool = False):
+        filter_expression = Attr("shipping_status").is_in(list(statuses))
+        if not include_archived:
+            filter_expression &= Attr("archived_at").not_exists()
+        scan_kwargs = {
+            "FilterExpression": filter_expression,
+            "Limit": page_size
+        }
+        while True:
+            response = self.table.scan(**scan_kwargs)
+            yield from response.get("Items", [])
+
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            scan_kwargs["ExclusiveStartKey"] = last_key
@@ -53,9 +53,9 @@ class ShippingService:
         return shipping['shipping_status']
 
     def fail_shipping(self, shipping_id):
-        response = self.repository.update_shipping_status(shipping_id, self.SHIPPING_FAILED)
+        response = self.repository.update_shipping_status(shipping_id, self.SHIPPING_FAILED, finished=True)
         return response['ResponseMetadata']
 
     def complete_shipping(self, shipping_id):
-        response = self.repository.update_shipping_status(shipping_id, self.SHIPPING_COMPLETED)
+        response = self.repository.update_shipping_status(shipping_id, self.SHIPPING_COMPLETED, finished=True)
         return response['ResponseMetadata']
@@ -1,7 +1,7 @@
 import pytest
 import boto3
 from services.config import *
-from services.db import get_dynamodb_resource
+from services.db import get_dynamodb_resource, enable_time_to_live
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_localstack_resources():
@@ -21,6 +21,7 @@ def setup_localstack_resources():
             BillingMode="PAY_PER_REQUEST",
         )
         dynamo_client.get_waiter("table_exists").wait(TableName=SHIPPING_TABLE_NAME)
+        enable_time_to_live(SHIPPING_TABLE_NAME)
     sqs_client = boto3.client(
         "sqs",
         endpoint_url=AWS_ENDPOINT_URL,
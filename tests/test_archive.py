@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from services import ShippingService
+from services.archive import ShippingArchiveExporter, ShippingArchiveReader
+from services.memory import InMemoryShippingRepository
+
+
+class TestShippingArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.items = [
+            {
+                "shipping_id": f"shipping_{i}",
+                "shipping_status": "completed" if i % 2 else "failed",
+                "expires_at": Decimal(1700000000 + i)
+            }
+            for i in range(5)
+        ]
+        self.repository = MagicMock()
+        self.repository.scan_shipping_by_status.return_value = iter(self.items)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_export_splits_into_chunks(self):
+        exporter = ShippingArchiveExporter(self.repository, self.tmp_dir.name, chunk_size=2)
+        paths = exporter.export_finished_shipping()
+        self.assertEqual(len(paths), 3, '5 доставок по 2 на файл мають дати 3 файли')
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+        self.repository.scan_shipping_by_status.assert_called_with(ShippingArchiveExporter.TERMINAL_STATUSES)
+
+    def test_export_without_finished_shipping_creates_no_files(self):
+        self.repository.scan_shipping_by_status.return_value = iter([])
+        exporter = ShippingArchiveExporter(self.repository, self.tmp_dir.name)
+        self.assertEqual(exporter.export_finished_shipping(), [])
+
+    def test_reader_round_trip(self):
+        ShippingArchiveExporter(self.repository, self.tmp_dir.name, chunk_size=2).export_finished_shipping()
+        reader = ShippingArchiveReader(self.tmp_dir.name)
+        items = list(reader.iter_shipping())
+        self.assertEqual([item["shipping_id"] for item in items], [item["shipping_id"] for item in self.items])
+        self.assertEqual(items[0]["expires_at"], 1700000000)
+
+    def test_reader_filters(self):
+        ShippingArchiveExporter(self.repository, self.tmp_dir.name).export_finished_shipping()
+        reader = ShippingArchiveReader(self.tmp_dir.name)
+        self.assertEqual(len(list(reader.iter_shipping(shipping_status="completed"))), 2)
+        self.assertEqual(reader.get_shipping("shipping_3")["shipping_status"], "completed")
+        self.assertIsNone(reader.get_shipping("missing"))
+        self.assertEqual(reader.count_by_status(), {"failed": 3, "completed": 2})
+
+    def test_export_marks_chunks_as_archived(self):
+        exporter = ShippingArchiveExporter(self.repository, self.tmp_dir.name, chunk_size=2)
+        exporter.export_finished_shipping()
+        marked = [call.args[0] for call in self.repository.mark_shipping_archived.call_args_list]
+        self.assertEqual(marked, [["shipping_0", "shipping_1"], ["shipping_2", "shipping_3"], ["shipping_4"]])
+
+    def test_repeated_export_is_incremental(self):
+        repository = InMemoryShippingRepository()
+        due_date = datetime.now(timezone.utc) + timedelta(minutes=1)
+        for i in range(3):
+            shipping_id = repository.create_shipping("Нова Пошта", ["product1"], f"order_{i}", "in progress", due_date)
+            repository.update_shipping_status(shipping_id, ShippingService.SHIPPING_COMPLETED, finished=True)
+        exporter = ShippingArchiveExporter(repository, self.tmp_dir.name)
+        reader = ShippingArchiveReader(self.tmp_dir.name)
+
+        self.assertEqual(len(exporter.export_finished_shipping()), 1)
+        self.assertEqual(exporter.export_finished_shipping(), [], 'Повторний експорт не має дублювати доставки')
+        self.assertEqual(reader.count_by_status(), {"completed": 3})
+
+        shipping_id = repository.create_shipping("Укр Пошта", ["product2"], "order_3", "in progress", due_date)
+        repository.update_shipping_status(shipping_id, ShippingService.SHIPPING_FAILED, finished=True)
+        exporter.export_finished_shipping()
+        self.assertEqual(reader.count_by_status(), {"completed": 3, "failed": 1})
+        self.assertEqual(len(list(reader.iter_shipping())), 4)
+
+    def test_finished_status_restarts_expiry(self):
+        repository = InMemoryShippingRepository()
+        shipping_id = repository.create_shipping(
+            "Нова Пошта", ["product1"], "order_1", "in progress", datetime.now(timezone.utc) + timedelta(minutes=1)
+        )
+        repository.items[shipping_id]["expires_at"] = 0
+        repository.update_shipping_status(shipping_id, ShippingService.SHIPPING_IN_PROGRESS)
+        self.assertEqual(repository.get_shipping(shipping_id)["expires_at"], 0)
+        repository.update_shipping_status(shipping_id, ShippingService.SHIPPING_COMPLETED, finished=True)
+        self.assertGreater(repository.get_shipping(shipping_id)["expires_at"], datetime.now(timezone.utc).timestamp())
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            ShippingArchiveExporter(self.repository, self.tmp_dir.name, chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+from app.cart_snapshot import SNAPSHOT_DELTA, SNAPSHOT_FULL, encode_snapshot
+from app.eshop import Product, ShoppingCart
+from app.pricing import PricingEngine
+
+
+class TestCartSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.catalog = {f'product_{i}': Product(name=f'product_{i}', price=10.0, available_amount=100) for i in range(5)}
+        self.cart = ShoppingCart()
+        for name in ('product_0', 'product_1', 'product_2'):
+            self.cart.add_product(self.catalog[name], 3)
+
+    def counts(self, cart):
+        return {str(product): count for product, count in cart.products.items()}
+
+    def test_round_trip(self):
+        restored = ShoppingCart.from_bytes(self.cart.to_bytes(), self.catalog.get)
+        self.assertEqual(self.counts(restored), self.counts(self.cart))
+        self.assertEqual(restored.version, self.cart.version)
+        self.assertIs(next(iter(restored.products)), self.catalog['product_0'], 'Продукти мають братися з каталогу')
+
+    def test_empty_cart_round_trip(self):
+        restored = ShoppingCart.from_bytes(ShoppingCart().to_bytes(), self.catalog.get)
+        self.assertEqual(restored.products, {})
+
+    def test_unicode_product_names(self):
+        product = Product(name='Ноутбук', price=1000.0, available_amount=5)
+        cart = ShoppingCart()
+        cart.add_product(product, 2)
+        restored = ShoppingCart.from_bytes(cart.to_bytes(), {'Ноутбук': product}.get)
+        self.assertEqual(restored.products, {product: 2})
+
+    def test_delta_applies_small_edit(self):
+        base = self.cart.to_bytes()
+        session_cart = ShoppingCart.from_bytes(base, self.catalog.get)
+        self.cart.remove_product(self.catalog['product_0'])
+        self.cart.add_product(self.catalog['product_1'], 5)
+        self.cart.add_product(self.catalog['product_4'], 1)
+
+        delta = self.cart.to_delta_bytes(base)
+        session_cart.apply_delta(delta, self.catalog.get)
+        self.assertEqual(self.counts(session_cart), self.counts(self.cart))
+        self.assertEqual(session_cart.version, self.cart.version)
+
+    def test_delta_with_wrong_base_version_fails(self):
+        base = self.cart.to_bytes()
+        self.cart.add_product(self.catalog['product_4'], 1)
+        delta = self.cart.to_delta_bytes(base)
+        with self.assertRaises(ValueError):
+            self.cart.apply_delta(delta, self.catalog.get)
+
+    def test_failed_delta_leaves_cart_untouched(self):
+        base = self.cart.to_bytes()
+        edited = ShoppingCart.from_bytes(base, self.catalog.get)
+        edited.remove_product(self.catalog['product_0'])
+        edited.add_product(Product(name='unknown', price=1.0, available_amount=1), 1)
+        delta = edited.to_delta_bytes(base)
+
+        session_cart = ShoppingCart.from_bytes(base, self.catalog.get)
+        engine = PricingEngine([])
+        self.assertEqual(engine.price_cart(session_cart).total, 90.0)
+        with self.assertRaises(ValueError):
+            session_cart.apply_delta(delta, self.catalog.get)
+        self.assertEqual(self.counts(session_cart), self.counts(self.cart), 'Корзина не має змінитися частково')
+        self.assertEqual(engine.price_cart(session_cart).total, session_cart.calculate_total())
+
+    def test_zero_count_in_full_snapshot_fails(self):
+        data = encode_snapshot(SNAPSHOT_FULL, 1, 0, {'product_0': 0})
+        with self.assertRaises(ValueError):
+            ShoppingCart.from_bytes(data, self.catalog.get)
+
+    def test_delta_must_move_version_forward(self):
+        base = self.cart.to_bytes()
+        older_cart = ShoppingCart()
+        older_cart.add_product(self.catalog['product_4'], 1)
+        with self.assertRaises(ValueError):
+            older_cart.to_delta_bytes(base)
+
+        session_cart = ShoppingCart.from_bytes(base, self.catalog.get)
+        engine = PricingEngine([])
+        self.assertEqual(engine.price_cart(session_cart).total, 90.0)
+        backwards = encode_snapshot(SNAPSHOT_DELTA, 1, session_cart.version, {'product_4': 1})
+        with self.assertRaises(ValueError):
+            session_cart.apply_delta(backwards, self.catalog.get)
+
+        # A forward delta and later edits must never hit a stale cached total
+        self.cart.add_product(self.catalog['product_4'], 1)
+        session_cart.apply_delta(self.cart.to_delta_bytes(base), self.catalog.get)
+        self.assertEqual(engine.price_cart(session_cart).total, 100.0)
+        session_cart.add_product(self.catalog['product_3'], 2)
+        self.assertEqual(engine.price_cart(session_cart).total, session_cart.calculate_total())
+
+    def test_count_out_of_range_fails(self):
+        product = Product(name='Bulk', price=1.0, available_amount=2 ** 33)
+        cart = ShoppingCart()
+        cart.add_product(product, 2 ** 32)
+        with self.assertRaises(ValueError):
+            cart.to_bytes()
+
+    def test_unknown_product_fails(self):
+        with self.assertRaises(ValueError):
+            ShoppingCart.from_bytes(self.cart.to_bytes(), {}.get)
+
+    def test_corrupted_snapshot_fails(self):
+        data = self.cart.to_bytes()
+        with self.assertRaises(ValueError):
+            ShoppingCart.from_bytes(b'XX' + data[2:], self.catalog.get)
+        with self.assertRaises(ValueError):
+            ShoppingCart.from_bytes(data[:10], self.catalog.get)
+        with self.assertRaises(ValueError):
+            ShoppingCart.from_bytes(self.cart.to_delta_bytes(data), self.catalog.get)
+
+
+if __name__ == '__main__':
+    unittest.main()
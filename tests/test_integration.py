@@ -121,6 +121,7 @@ def test_shipping_repository_create_shipping(dynamo_resource):
     assert shipping["shipping_type"] == "Нова Пошта"
     assert shipping["product_ids"] == "product1,product2"
     assert shipping["shipping_status"] == "created"
+    assert shipping["expires_at"] > datetime.now(timezone.utc).timestamp()
 
 # Тест 2: Перевірка оновлення статусу в ShippingRepository
 def test_shipping_repository_update_status(dynamo_resource):
@@ -259,3 +260,24 @@ def test_order_place_with_invalid_shipping_type_fails(dynamo_resource):
     assert "Shipping type is not available" in str(excinfo.value)
     assert product.available_amount == 5
     assert not cart.products
+
+
+# Тест 11: Перевірка TTL та позначки архівації в ShippingRepository
+def test_shipping_repository_finished_shipping_archived_once(dynamo_resource):
+    repo = ShippingRepository()
+    shipping_id = repo.create_shipping(
+        shipping_type="Нова Пошта",
+        product_ids=["product1"],
+        order_id=str(uuid.uuid4()),
+        status="in progress",
+        due_date=datetime.now(timezone.utc) + timedelta(seconds=5)
+    )
+    repo.update_shipping_status(shipping_id, "completed", finished=True)
+    assert repo.get_shipping(shipping_id)["expires_at"] > datetime.now(timezone.utc).timestamp()
+    assert shipping_id in [item["shipping_id"] for item in repo.scan_shipping_by_status(["completed"])]
+
+    repo.mark_shipping_archived([shipping_id])
+    assert shipping_id not in [item["shipping_id"] for item in repo.scan_shipping_by_status(["completed"])]
+    assert shipping_id in [
+        item["shipping_id"] for item in repo.scan_shipping_by_status(["completed"], include_archived=True)
+    ]
@@ -0,0 +1,161 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from app.loadgen import (
+    run_load, percentiles, run_consumer, shipping_outcomes, LagTrackingPublisher, LoadStats,
+    TrackingShippingService, Customer
+)
+from services import ShippingService
+from services.memory import InMemoryShippingRepository, InMemoryShippingPublisher
+
+
+class TestInMemoryBackend(unittest.TestCase):
+    def test_shipping_flow(self):
+        service = ShippingService(InMemoryShippingRepository(), InMemoryShippingPublisher(wait_seconds=0))
+        shipping_id = service.create_shipping(
+            ShippingService.list_available_shipping_type()[0],
+            ["product1"],
+            "order_1",
+            datetime.now(timezone.utc) + timedelta(minutes=1)
+        )
+        self.assertEqual(service.check_status(shipping_id), ShippingService.SHIPPING_IN_PROGRESS)
+        service.process_shipping_batch()
+        self.assertEqual(service.check_status(shipping_id), ShippingService.SHIPPING_COMPLETED)
+
+
+class TestLoadGenerator(unittest.TestCase):
+    def test_percentiles(self):
+        stats = percentiles([0.001 * i for i in range(1, 101)])
+        self.assertEqual(stats["count"], 100)
+        self.assertEqual(stats["max_ms"], 100.0)
+        self.assertEqual(percentiles([]), {"count": 0})
+
+    def test_closed_loop_summary(self):
+        summary = run_load(customers=2, consumers=1, duration=0.2)
+        self.assertGreater(summary["orders"]["placed"], 0)
+        self.assertEqual(summary["orders"]["error_rate"], 0.0)
+        self.assertEqual(summary["shipping"]["processed"], summary["orders"]["placed"])
+        self.assertIn("queue_lag", summary["stages"])
+
+        shipping = summary["shipping"]
+        self.assertEqual(sum(shipping["final_status"].values()), summary["orders"]["placed"])
+        self.assertEqual(shipping["processed"], summary["orders"]["placed"])
+        self.assertEqual(shipping["unprocessed"], 0)
+        self.assertEqual(shipping["errored"], 0)
+        self.assertEqual(shipping["dropped"], 0)
+        self.assertEqual(shipping["failed"], 0)
+        # Lost updates come from the publish-before-status-write race in ShippingService.create_shipping
+        self.assertEqual(
+            shipping["final_status"].get(ShippingService.SHIPPING_COMPLETED, 0),
+            summary["orders"]["placed"] - shipping["lost_update"]
+        )
+        expected_rate = (shipping["failed"] + shipping["lost_update"]) / summary["orders"]["placed"]
+        self.assertAlmostEqual(shipping["error_rate"], expected_rate, places=5)
+
+    def test_rejected_orders_are_errors(self):
+        summary = run_load(customers=1, consumers=1, duration=0.1, due_seconds=-1)
+        self.assertEqual(summary["orders"]["placed"], 0)
+        self.assertEqual(summary["orders"]["error_rate"], 1.0)
+        self.assertGreater(summary["errors"]["place_order"], 0)
+
+    def test_shipping_outcomes(self):
+        repository = InMemoryShippingRepository()
+        stats = LoadStats()
+        publisher = LagTrackingPublisher(InMemoryShippingPublisher(wait_seconds=0), stats)
+        due_date = datetime.now(timezone.utc) + timedelta(minutes=1)
+        ids = [repository.create_shipping("Нова Пошта", ["product1"], f"order_{i}", "in progress", due_date)
+               for i in range(4)]
+        for shipping_id in ids[:3]:
+            publisher.send_new_shipping(shipping_id)
+        publisher.poll_shipping()
+        repository.update_shipping_status(ids[0], ShippingService.SHIPPING_COMPLETED, finished=True)
+        repository.update_shipping_status(ids[1], ShippingService.SHIPPING_FAILED, finished=True)
+
+        outcomes = shipping_outcomes(repository, ids, publisher, set(ids[:3]), set())
+        self.assertEqual(outcomes["final_status"], {"completed": 1, "failed": 1, "in progress": 2})
+        self.assertEqual(outcomes["processed"], 3)
+        self.assertEqual(outcomes["failed"], 1)
+        self.assertEqual(outcomes["lost_update"], 1)
+        self.assertEqual(outcomes["unprocessed"], 1)
+
+    def test_stale_message_is_not_a_lost_update(self):
+        repository = InMemoryShippingRepository()
+        stats = LoadStats()
+        publisher = LagTrackingPublisher(InMemoryShippingPublisher(wait_seconds=0), stats)
+        service = TrackingShippingService(repository, publisher, stats)
+        due_date = datetime.now(timezone.utc) + timedelta(minutes=1)
+        publisher.send_new_shipping("stale_shipping")
+        ids = [repository.create_shipping("Нова Пошта", ["product1"], f"order_{i}", "in progress", due_date)
+               for i in range(3)]
+        for shipping_id in ids:
+            publisher.send_new_shipping(shipping_id)
+
+        with self.assertRaises(TypeError):
+            service.process_shipping_batch()
+        _, errors, _, processed_ids, errored_ids = stats.snapshot()
+        self.assertEqual(errors, {"process_shipping": 1})
+        self.assertEqual(errored_ids, {"stale_shipping"})
+
+        outcomes = shipping_outcomes(repository, ids, publisher, processed_ids, errored_ids)
+        self.assertEqual(outcomes["processed"], 0)
+        self.assertEqual(outcomes["lost_update"], 0)
+        self.assertEqual(outcomes["dropped"], 3, 'Доставки з перерваного батчу не мають рахуватися обробленими')
+
+    def test_customer_has_one_order_in_flight(self):
+        in_flight = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def create_shipping(*args):
+            with lock:
+                in_flight.append(1)
+                overlaps.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.pop()
+            return "shipping_1"
+
+        service = MagicMock()
+        service.create_shipping.side_effect = create_shipping
+        customer = Customer(service, LoadStats(), products_per_cart=1, due_seconds=60)
+        threads = [threading.Thread(target=customer.place_order) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(max(overlaps), 1)
+        self.assertEqual(customer.catalog[0].available_amount, 10 ** 9 - 3)
+
+    def test_consumer_backs_off_on_errors(self):
+        service = MagicMock()
+        service.process_shipping_batch.side_effect = ConnectionError("backend is down")
+        stats = LoadStats()
+        stop, abort = threading.Event(), threading.Event()
+        stop.set()
+        publisher = MagicMock()
+        publisher.pending.return_value = 1
+        consumer = threading.Thread(target=run_consumer, args=(service, stats, stop, abort, publisher))
+        consumer.start()
+        abort.wait(0.3)
+        abort.set()
+        consumer.join()
+        self.assertLess(stats.snapshot()[1]["process_shipping_batch"], 10, 'Споживач не має крутитися в циклі')
+
+    def test_fixed_rate_summary(self):
+        summary = run_load(customers=2, consumers=1, duration=0.2, rate=50)
+        self.assertEqual(summary["config"]["mode"], "fixed_rate")
+        self.assertLessEqual(summary["orders"]["placed"], 11)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            run_load(customers=0)
+        with self.assertRaises(ValueError):
+            run_load(rate=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
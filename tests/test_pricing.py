@@ -0,0 +1,94 @@
+import unittest
+from app.eshop import Product, ShoppingCart
+from app.pricing import PricingEngine, PercentageDiscount, BuyNGetM, TieredPricing
+
+
+class TestPricingEngine(unittest.TestCase):
+    def setUp(self):
+        self.phone = Product(name='Phone', price=100.0, available_amount=100, category='electronics')
+        self.cable = Product(name='Cable', price=10.0, available_amount=100, category='accessories')
+        self.cart = ShoppingCart()
+
+    def test_engine_without_rules_matches_plain_total(self):
+        self.cart.add_product(self.phone, 2)
+        self.cart.add_product(self.cable, 3)
+        engine = PricingEngine([])
+        self.assertEqual(self.cart.calculate_total(engine), self.cart.calculate_total())
+
+    def test_percentage_discount_for_product(self):
+        self.cart.add_product(self.phone, 2)
+        engine = PricingEngine([PercentageDiscount(10, product_names=('Phone',))])
+        self.assertAlmostEqual(self.cart.calculate_total(engine), 180.0)
+
+    def test_category_promo_uses_best_percent(self):
+        self.cart.add_product(self.phone, 1)
+        engine = PricingEngine([
+            PercentageDiscount(10, product_names=('Phone',)),
+            PercentageDiscount(25, category='electronics'),
+        ])
+        self.assertAlmostEqual(self.cart.calculate_total(engine), 75.0)
+
+    def test_buy_n_get_m(self):
+        self.cart.add_product(self.cable, 7)
+        engine = PricingEngine([BuyNGetM('Cable', buy=2, get=1)])
+        self.assertAlmostEqual(self.cart.calculate_total(engine), 50.0, msg='7 кабелів: 2 безкоштовні')
+
+    def test_tiered_pricing(self):
+        engine = PricingEngine([TieredPricing('Cable', tiers=((5, 8.0), (10, 6.0)))])
+        self.cart.add_product(self.cable, 4)
+        self.assertAlmostEqual(self.cart.calculate_total(engine), 40.0)
+        self.cart.add_product(self.cable, 5)
+        self.assertAlmostEqual(self.cart.calculate_total(engine), 40.0)
+        self.cart.add_product(self.cable, 10)
+        self.assertAlmostEqual(self.cart.calculate_total(engine), 60.0)
+
+    def test_result_is_cached_per_cart_version(self):
+        self.cart.add_product(self.phone, 1)
+        engine = PricingEngine([])
+        first = engine.price_cart(self.cart)
+        self.assertIs(engine.price_cart(self.cart), first)
+        self.cart.add_product(self.cable, 1)
+        self.assertIsNot(engine.price_cart(self.cart), first)
+        self.assertAlmostEqual(engine.price_cart(self.cart).total, 110.0)
+
+    def test_price_carts_batch(self):
+        other_cart = ShoppingCart()
+        other_cart.add_product(self.cable, 2)
+        self.cart.add_product(self.phone, 1)
+        engine = PricingEngine([PercentageDiscount(50, category='accessories')])
+        totals = [priced.total for priced in engine.price_carts([self.cart, other_cart])]
+        self.assertEqual(totals, [100.0, 10.0])
+
+    def test_conflicting_rules_are_rejected(self):
+        with self.assertRaises(ValueError):
+            PricingEngine([BuyNGetM('Cable', buy=2, get=1), BuyNGetM('Cable', buy=3, get=1)])
+        with self.assertRaises(ValueError):
+            PricingEngine([TieredPricing('Cable', tiers=((5, 8.0),)), TieredPricing('Cable', tiers=((10, 6.0),))])
+
+    def test_cached_result_is_immutable(self):
+        self.cart.add_product(self.phone, 1)
+        engine = PricingEngine([])
+        priced = engine.price_cart(self.cart)
+        with self.assertRaises(AttributeError):
+            priced.discount = 100.0
+        with self.assertRaises(AttributeError):
+            priced.lines.append(None)
+        self.assertEqual(engine.price_cart(self.cart).total, 100.0)
+
+    def test_invalid_rules(self):
+        with self.assertRaises(ValueError):
+            PercentageDiscount(0, product_names=('Phone',))
+        with self.assertRaises(ValueError):
+            PercentageDiscount(10)
+        with self.assertRaises(ValueError):
+            PercentageDiscount(10, product_names='Phone')
+        with self.assertRaises(ValueError):
+            TieredPricing('Cable', tiers=())
+        with self.assertRaises(ValueError):
+            BuyNGetM('Cable', buy=0, get=1)
+        with self.assertRaises(ValueError):
+            PricingEngine(['unknown'])
+
+
+if __name__ == '__main__':
+    unittest.main()